@@ -1469,17 +1469,9 @@ function ClientManagerModal({ onClose }) {
   const fetchAllGrowers = async () => {
     setLoading(true);
     try {
-      // Get all companies first
-      const companiesRes = await fetch(`${API_BASE}/companies/`);
-      const companies = await companiesRes.json();
-      
-      // Get all growers for each company
-      let allGrowers = [];
-      for (const company of companies) {
-        const growersRes = await fetch(`${API_BASE}/growers/company/${company.id}`);
-        const companyGrowers = await growersRes.json();
-        allGrowers = [...allGrowers, ...companyGrowers];
-      }
+      // Get every grower (with company_name) in one request
+      const growersRes = await fetch(`${API_BASE}/hierarchy/?depth=growers`);
+      const allGrowers = await growersRes.json();
       
       setGrowers(allGrowers);
       setFilteredGrowers(allGrowers);
@@ -1635,16 +1627,15 @@ function ClientForm({ grower, onClose, onSave }) {
     setLoading(true);
     try {
       if (grower) {
-        const farmsRes = await fetch(`${API_BASE}/farms/grower/${grower.id}`);
-        const farmsData = await farmsRes.json();
+        // Farms and their fields for this grower in one request
+        const treeRes = await fetch(`${API_BASE}/hierarchy/?grower_id=${grower.id}`);
+        const [growerTree] = await treeRes.json();
+        const farmsData = growerTree ? growerTree.farms : [];
         setFarms(farmsData);
 
-        let allFields = [];
-        for (const farm of farmsData) {
-          const fieldsRes = await fetch(`${API_BASE}/fields/farm/${farm.id}`);
-          const fieldsData = await fieldsRes.json();
-          allFields = [...allFields, ...fieldsData.map(f => ({ ...f, farm_name: farm.farm_name }))];
-        }
+        const allFields = farmsData.flatMap(farm =>
+          farm.fields.map(f => ({ ...f, farm_name: farm.farm_name }))
+        );
         setFields(allFields);
       }
     } catch (err) {
@@ -0,0 +1,123 @@
+# bench_create_batch.py - Per-row vs bulk sample insertion for create_batch
+#
+# Runs against the local portal database (main.DATABASE_URL). Every run
+# happens inside a transaction that is rolled back, so nothing is kept.
+#
+#   python benchmarks/bench_create_batch.py
+#   python benchmarks/bench_create_batch.py --sizes 10 100 1000 5000 --repeat 3
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+import main
+
+def insert_samples_per_row(cur, batch_id, batch_number, company_id, samples, is_outside_us):
+    """The original create_batch loop: two INSERTs per sample."""
+    sample_ids = []
+    for idx, sample in enumerate(samples, start=1):
+        bag_id = f"{batch_number:05d}-{idx}"
+        lime_history_json = None
+        if sample.lime_history:
+            lime_history_json = json.dumps([entry.dict() for entry in sample.lime_history])
+
+        cur.execute("""
+            INSERT INTO samples
+            (batch_id, sample_sequence, bag_id, company_id, grower_id, farm_id, field_id,
+            sample_name, zone, plot_id, crop, yield_goal, previous_crop, previous_crop_yield,
+            lime_history, acres, latitude, longitude, elevation, collect_datetime,
+            special_notes, program_level, organic, quarantine)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING id
+        """, (
+            batch_id, idx, bag_id, company_id, sample.grower_id,
+            sample.farm_id, sample.field_id, sample.sample_name, sample.zone,
+            sample.plot_id, sample.crop, sample.yield_goal, sample.previous_crop,
+            sample.previous_crop_yield, lime_history_json,
+            sample.acres, sample.latitude, sample.longitude, sample.elevation,
+            sample.collect_datetime, sample.special_notes, sample.program_level,
+            sample.organic, is_outside_us
+        ))
+        sample_id = cur.fetchone()["id"]
+        sample_ids.append(sample_id)
+
+        tests = sample.tests.dict()
+        cur.execute(f"""
+            INSERT INTO sample_tests (sample_id, {", ".join(tests.keys())})
+            VALUES (%s, {", ".join(["%s"] * len(tests))})
+        """, (sample_id, *tests.values()))
+    return sample_ids
+
+def find_field(cur):
+    cur.execute("""
+        SELECT g.company_id, g.id AS grower_id, f.id AS farm_id, fd.id AS field_id
+        FROM fields fd
+        JOIN farms f ON fd.farm_id = f.id
+        JOIN growers g ON f.grower_id = g.id
+        ORDER BY fd.id
+        LIMIT 1
+    """)
+    row = cur.fetchone()
+    if not row:
+        sys.exit("Need at least one company/grower/farm/field in the database to benchmark")
+    return row
+
+def make_samples(n, ids):
+    return [
+        main.SampleCreate(
+            grower_id=ids["grower_id"], farm_id=ids["farm_id"], field_id=ids["field_id"],
+            sample_name=f"Bench {i}", zone=str(i % 12), plot_id=f"B{i:05d}",
+            crop="CORN", yield_goal=200, acres=2.5, latitude=41.0, longitude=-95.0,
+            lime_history=[main.LimeHistoryEntry(type="Dolomite", month=4, year=2024, amount_lbs_ac=1000)],
+        )
+        for i in range(1, n + 1)
+    ]
+
+def time_insert(conn, insert_fn, samples, ids):
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        cur.execute("SELECT generate_batch_id()")
+        batch_id = cur.fetchone()["generate_batch_id"]
+        batch_number = int(batch_id.split('-')[1])
+        cur.execute("""
+            INSERT INTO submission_batches (batch_id, company_id, batch_number, sample_count, created_by)
+            VALUES (%s, %s, %s, %s, 'Benchmark')
+        """, (batch_id, ids["company_id"], batch_number, len(samples)))
+
+        start = time.perf_counter()
+        sample_ids = insert_fn(cur, batch_id, batch_number, ids["company_id"], samples, False)
+        elapsed = time.perf_counter() - start
+    conn.rollback()
+    assert len(sample_ids) == len(samples)
+    return elapsed
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Per-row vs bulk create_batch inserts")
+    parser.add_argument("--dsn", default=main.DATABASE_URL)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.dsn)
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        ids = find_field(cur)
+    conn.rollback()
+
+    print(f"{'samples':>8} {'per-row (s)':>12} {'bulk (s)':>10} {'speedup':>8}")
+    for n in args.sizes:
+        samples = make_samples(n, ids)
+        per_row = min(time_insert(conn, insert_samples_per_row, samples, ids) for _ in range(args.repeat))
+        bulk = min(time_insert(conn, main._insert_batch_samples, samples, ids) for _ in range(args.repeat))
+        print(f"{n:>8} {per_row:>12.4f} {bulk:>10.4f} {per_row / bulk:>7.1f}x")
+
+    conn.close()
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,117 @@
+# bench_csv_encoder.py - Lab CSV rows built by hand vs the compiled CsvLayout encoder
+#
+# Pure Python, no database. Encodes --rows synthetic LAB_CSV_SAMPLES_SELECT
+# rows with the original per-row builder (literal list + 34-key test_map
+# dict) and with LAB_CSV_LAYOUT.encode, with and without csv.writer.
+#
+#   python benchmarks/bench_csv_encoder.py --rows 100000
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+def lab_csv_row_by_hand(sample, batch_id):
+    """The original row builder, reading the sample_tests columns."""
+    row = [
+        "",
+        batch_id,
+        "",
+        sample["sample_name"] or sample["field_name"] or "",
+        sample["collect_datetime"].strftime("%m/%d/%y") if sample["collect_datetime"] else "",
+        sample["grower_name"] or "",
+        sample["farm_name"] or "",
+        sample["field_name"] or "",
+        sample["acres"] or "",
+        sample["latitude"] or "",
+        sample["longitude"] or "",
+        sample["elevation"] or "",
+        sample["bag_id"],
+        sample["special_notes"] or "",
+        "Y" if sample["quarantine"] else "N",
+        sample["crop"] or "",
+        sample["yield_goal"] or "",
+        "", "", "", "", "", "", "", "", "", "",
+    ]
+    test_map = {
+        header: (sample.get(column) if column else "")
+        for header, column in main.LAB_CSV_TEST_COLUMNS
+    }
+    for test in test_map.values():
+        row.append("Y" if test else "")
+    return row
+
+def make_rows(n, profiles):
+    masks = [random.getrandbits(len(main.SAMPLE_TEST_BITS)) for _ in range(profiles)]
+    rows = []
+    for i in range(1, n + 1):
+        mask = random.choice(masks)
+        row = {
+            "sample_name": f"Sample {i}" if i % 4 else None,
+            "field_name": f"Field {i % 50}",
+            "collect_datetime": datetime(2024, 4, 1 + i % 28),
+            "grower_name": f"Grower {i % 20}",
+            "farm_name": f"Farm {i % 35}",
+            "acres": 2.5,
+            "latitude": 41.0 + i / 1e6,
+            "longitude": -95.0 - i / 1e6,
+            "elevation": None,
+            "bag_id": f"00042-{i}",
+            "special_notes": None,
+            "quarantine": i % 10 == 0,
+            "crop": "CORN",
+            "yield_goal": 200,
+            "test_mask": mask,
+        }
+        row.update(main.decode_test_mask(mask))
+        rows.append(row)
+    return rows
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def write_all(encode, rows):
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(main.LAB_CSV_HEADERS)
+    writer.writerows(encode(row, "B-00042") for row in rows)
+    return output.getvalue()
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Lab CSV row encoder microbenchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--profiles", type=int, default=4, help="distinct test selections")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.profiles)
+    compiled = main.LAB_CSV_LAYOUT.encode
+    assert write_all(lab_csv_row_by_hand, rows) == write_all(compiled, rows), "encoders differ"
+
+    timings = [
+        ("encode", best_of(args.repeat, lambda: [lab_csv_row_by_hand(r, "B-00042") for r in rows]),
+                   best_of(args.repeat, lambda: [compiled(r, "B-00042") for r in rows])),
+        ("encode+csv", best_of(args.repeat, lambda: write_all(lab_csv_row_by_hand, rows)),
+                       best_of(args.repeat, lambda: write_all(compiled, rows))),
+    ]
+
+    print(f"{args.rows} rows x {len(main.LAB_CSV_HEADERS)} columns")
+    print(f"{'step':>11} {'by hand (s)':>12} {'compiled (s)':>13} {'rows/sec':>11} {'speedup':>8}")
+    for name, by_hand, layout in timings:
+        print(f"{name:>11} {by_hand:>12.4f} {layout:>13.4f} {args.rows / layout:>11,.0f} {by_hand / layout:>7.1f}x")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,105 @@
+# bench_lab_import.py - Lab result import throughput (per-cell INSERT vs COPY)
+#
+# Builds a throwaway batch with synthetic samples, then loads a synthetic
+# lab CSV of --rows x --columns into lab_result_data with both the original
+# per-cell INSERT loop and the COPY pipeline used by import_lab_results.
+# Everything runs in a transaction that is rolled back.
+#
+#   python benchmarks/bench_lab_import.py --rows 300 --columns 60
+import argparse
+import csv
+import os
+import sys
+import time
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+import main
+from bench_create_batch import find_field, make_samples
+
+def store_rows_per_cell(cur, lab_result_id, batch_id, rows):
+    """The original import loop: one SELECT per row, one INSERT per cell."""
+    row_count = 0
+    cells = 0
+    for row in rows:
+        row_count += 1
+        bag_id = row.get("BagId", "").strip()
+        cur.execute("""
+            SELECT id FROM samples
+            WHERE batch_id = %s AND bag_id = %s
+        """, (batch_id, bag_id))
+        sample = cur.fetchone()
+        sample_id = sample["id"] if sample else None
+        for field_name, field_value in row.items():
+            if field_value and field_value.strip():
+                cells += 1
+                cur.execute("""
+                    INSERT INTO lab_result_data
+                    (lab_result_id, sample_id, bag_id, field_name, field_value)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (lab_result_id, sample_id, bag_id, field_name, field_value.strip()))
+    return row_count, cells
+
+def make_lab_csv(batch_id, batch_number, n_rows, n_columns):
+    analytes = [f"Analyte{i:02d}" for i in range(n_columns - 4)]
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["LayerId", "ControlID", "BagId", "LabNo"] + analytes)
+    for idx in range(1, n_rows + 1):
+        writer.writerow([batch_id, "C1234", f"{batch_number:05d}-{idx}", str(idx)] +
+                        [f"{(idx * 7 + j) % 100 / 3:.2f}" for j in range(len(analytes))])
+    return output.getvalue()
+
+def time_store(conn, store_fn, ids, n_rows, n_columns):
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        cur.execute("SELECT generate_batch_id()")
+        batch_id = cur.fetchone()["generate_batch_id"]
+        batch_number = int(batch_id.split('-')[1])
+        cur.execute("""
+            INSERT INTO submission_batches (batch_id, company_id, batch_number, sample_count, created_by)
+            VALUES (%s, %s, %s, %s, 'Benchmark')
+        """, (batch_id, ids["company_id"], batch_number, n_rows))
+        main._insert_batch_samples(cur, batch_id, batch_number, ids["company_id"],
+                                   make_samples(n_rows, ids), False)
+        cur.execute("""
+            INSERT INTO lab_results (batch_id, control_id, csv_filename, csv_path, sample_count, imported_by)
+            VALUES (%s, 'C1234', 'bench.csv', 'bench.csv', %s, 'Benchmark')
+            RETURNING id
+        """, (batch_id, n_rows))
+        lab_result_id = cur.fetchone()["id"]
+
+        rows = list(csv.DictReader(StringIO(make_lab_csv(batch_id, batch_number, n_rows, n_columns))))
+        start = time.perf_counter()
+        _, cells = store_fn(cur, lab_result_id, batch_id, rows)
+        elapsed = time.perf_counter() - start
+    conn.rollback()
+    return elapsed, cells
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Lab result import throughput")
+    parser.add_argument("--dsn", default=main.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--columns", type=int, default=60)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.dsn)
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        ids = find_field(cur)
+    conn.rollback()
+
+    print(f"{args.rows} rows x {args.columns} columns")
+    print(f"{'method':>10} {'seconds':>9} {'rows/sec':>11} {'cells/sec':>12}")
+    for name, fn in (("per-cell", store_rows_per_cell), ("copy", main._store_lab_result_rows)):
+        elapsed, cells = time_store(conn, fn, ids, args.rows, args.columns)
+        print(f"{name:>10} {elapsed:>9.3f} {args.rows / elapsed:>11,.0f} {cells / elapsed:>12,.0f}")
+
+    conn.close()
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,104 @@
+# bench_lab_storage.py - Lab results as EAV text cells vs typed lab_result_samples rows
+#
+# Seeds a throwaway batch of --samples samples with --analytes lab result
+# cells each (imported the normal way, so both stores are written), then
+# compares rows and bytes stored per batch, and times a per-analyte
+# count/avg/min/max summary against each store.
+# Everything runs in a transaction that is rolled back.
+#
+#   python benchmarks/bench_lab_storage.py --samples 1000 --analytes 80
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+import main
+from bench_create_batch import find_field
+from bench_rec_export import seed
+
+# Casts and pivots the text cells, as any numeric question had to before
+EAV_SUMMARY = f"""
+    SELECT lrd.field_name AS analyte, count(*) AS n,
+           avg(lrd.field_value::float8) AS avg_value,
+           min(lrd.field_value::float8) AS min_value,
+           max(lrd.field_value::float8) AS max_value
+    FROM lab_result_data lrd
+    JOIN lab_results lr ON lr.id = lrd.lab_result_id
+    WHERE lr.batch_id = %s
+    AND lrd.field_value ~ '^{main.LAB_RESULT_NUMBER}$'
+    AND lrd.field_name <> ALL (%s)
+    GROUP BY lrd.field_name
+"""
+
+TYPED_SUMMARY = """
+    SELECT a.key AS analyte, count(*) AS n,
+           avg(a.value::float8) AS avg_value,
+           min(a.value::float8) AS min_value,
+           max(a.value::float8) AS max_value
+    FROM lab_result_samples lrs
+    CROSS JOIN LATERAL jsonb_each_text(lrs.analytes) a
+    WHERE lrs.batch_id = %s
+    GROUP BY a.key
+"""
+
+def storage(cur, table, batch_id):
+    """(rows, bytes) a batch takes in one store; bytes are row data plus tuple headers."""
+    cur.execute(f"""
+        SELECT count(*) AS n, COALESCE(sum(pg_column_size(t.*)), 0) AS size
+        FROM {table} t
+        WHERE t.lab_result_id IN (SELECT id FROM lab_results WHERE batch_id = %s)
+    """, (batch_id,))
+    row = cur.fetchone()
+    return row["n"], row["size"]
+
+def summarize(rows):
+    return {r["analyte"]: (r["n"], round(r["avg_value"], 6), r["min_value"], r["max_value"]) for r in rows}
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="EAV vs typed lab result storage benchmark")
+    parser.add_argument("--dsn", default=main.DATABASE_URL)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--analytes", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.dsn)
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        ids = find_field(cur)
+        batch_id = seed(cur, ids, args.samples, args.analytes)
+        cur.execute("ANALYZE lab_result_samples")
+
+        sizes = {name: storage(cur, name, batch_id) for name in ("lab_result_data", "lab_result_samples")}
+
+        timings = {}
+        outputs = {}
+        for name, query, params in (("eav", EAV_SUMMARY, (batch_id, list(main.LAB_RESULT_ID_FIELDS))),
+                                    ("typed", TYPED_SUMMARY, (batch_id,))):
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                cur.execute(query, params)
+                outputs[name] = summarize(cur.fetchall())
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+    conn.rollback()
+    conn.close()
+
+    assert outputs["eav"] == outputs["typed"], "summaries differ"
+    (eav_rows, eav_bytes), (typed_rows, typed_bytes) = sizes["lab_result_data"], sizes["lab_result_samples"]
+    print(f"{args.samples} samples x {args.analytes} analytes")
+    print(f"{'store':>6} {'rows':>9} {'MB':>8} {'summary (s)':>12}")
+    print(f"{'eav':>6} {eav_rows:>9} {eav_bytes / 1e6:>8.2f} {timings['eav']:>12.4f}")
+    print(f"{'typed':>6} {typed_rows:>9} {typed_bytes / 1e6:>8.2f} {timings['typed']:>12.4f}")
+    print(f"rows {eav_rows / typed_rows:.0f}x fewer, bytes {eav_bytes / typed_bytes:.1f}x smaller, "
+          f"summary {timings['eav'] / timings['typed']:.1f}x faster")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,114 @@
+# bench_rec_export.py - Rec system export pivot: Python dict pivot vs jsonb_object_agg
+#
+# Seeds a throwaway batch of --samples samples with --analytes lab result
+# cells each, then times the original fetch-everything-and-pivot-in-Python
+# export against the set-based pivot used by export_for_rec_system.
+# Everything runs in a transaction that is rolled back.
+#
+#   python benchmarks/bench_rec_export.py --samples 1000 --analytes 80
+import argparse
+import csv
+import os
+import sys
+import time
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+import main
+from bench_create_batch import find_field, make_samples
+from bench_lab_import import make_lab_csv
+
+def rec_system_rows_python(cur, batch_id, full_batch_id):
+    """The original export: fetch every EAV row and pivot in Python."""
+    cur.execute("""
+        SELECT lrd.*, s.bag_id, s.sample_sequence
+        FROM lab_result_data lrd
+        JOIN samples s ON lrd.sample_id = s.id
+        WHERE lrd.lab_result_id IN (
+            SELECT id FROM lab_results WHERE batch_id = %s
+        )
+        ORDER BY s.sample_sequence, lrd.field_name
+    """, (batch_id,))
+
+    samples_data = {}
+    for row in cur.fetchall():
+        sample_seq = row["sample_sequence"]
+        if sample_seq not in samples_data:
+            samples_data[sample_seq] = {"Batch_ID": full_batch_id}
+        samples_data[sample_seq][row["field_name"]] = row["field_value"]
+
+    all_fields = set()
+    for sample in samples_data.values():
+        all_fields.update(sample.keys())
+
+    headers = main._rec_system_headers(all_fields)
+    return headers, [samples_data[seq] for seq in sorted(samples_data)]
+
+def write_csv(headers, rows):
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=headers, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(rows)
+    return output.getvalue()
+
+def seed(cur, ids, n_samples, n_analytes):
+    cur.execute("SELECT generate_batch_id()")
+    batch_id = cur.fetchone()["generate_batch_id"]
+    batch_number = int(batch_id.split('-')[1])
+    cur.execute("""
+        INSERT INTO submission_batches (batch_id, company_id, batch_number, sample_count, created_by)
+        VALUES (%s, %s, %s, %s, 'Benchmark')
+    """, (batch_id, ids["company_id"], batch_number, n_samples))
+    main._insert_batch_samples(cur, batch_id, batch_number, ids["company_id"],
+                               make_samples(n_samples, ids), False)
+    cur.execute("""
+        INSERT INTO lab_results (batch_id, control_id, csv_filename, csv_path, sample_count, imported_by)
+        VALUES (%s, 'C1234', 'bench.csv', 'bench.csv', %s, 'Benchmark')
+        RETURNING id
+    """, (batch_id, n_samples))
+    lab_result_id = cur.fetchone()["id"]
+    rows = csv.DictReader(StringIO(make_lab_csv(batch_id, batch_number, n_samples, n_analytes + 4)))
+    main._store_lab_result_rows(cur, lab_result_id, batch_id, rows)
+    cur.execute("ANALYZE lab_result_data")
+    return batch_id
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Rec system export pivot benchmark")
+    parser.add_argument("--dsn", default=main.DATABASE_URL)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--analytes", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.dsn)
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        ids = find_field(cur)
+        batch_id = seed(cur, ids, args.samples, args.analytes)
+        full_batch_id = f"{batch_id}-C1234"
+
+        timings = {}
+        outputs = {}
+        for name, fn in (("python", rec_system_rows_python), ("jsonb", main._rec_system_rows)):
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                headers, rows = fn(cur, batch_id, full_batch_id)
+                outputs[name] = write_csv(headers, rows)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+    conn.rollback()
+    conn.close()
+
+    assert outputs["python"] == outputs["jsonb"], "pivot outputs differ"
+    print(f"{args.samples} samples x {args.analytes} analytes")
+    print(f"python pivot: {timings['python']:.4f}s")
+    print(f"jsonb pivot:  {timings['jsonb']:.4f}s ({timings['python'] / timings['jsonb']:.1f}x)")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,70 @@
+# bench_test_mask.py - Test selections: 34 boolean columns vs samples.test_mask
+#
+# Pure Python, no database. Times the per-sample work on both ends of a
+# batch: turning SampleTestsCreate into insert values, and turning stored
+# selections back into the lab CSV's Y/blank flag columns.
+#
+#   python benchmarks/bench_test_mask.py --samples 5000
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+def encode_columns(tests):
+    """The original insert path: one value per sample_tests column."""
+    values = tests.dict()
+    return tuple(values[col] for col in main.SampleTestsCreate.__fields__)
+
+def lab_csv_flags_columns(row):
+    """The original CSV path: rebuild a 34-entry map per sample."""
+    test_map = {header: (row.get(column) if column else "") for header, column in main.LAB_CSV_TEST_COLUMNS}
+    return ["Y" if test else "" for test in test_map.values()]
+
+def make_tests(n, profiles):
+    """n selections drawn from a few distinct profiles, as in a real batch."""
+    choices = []
+    for _ in range(profiles):
+        extras = random.sample(main.SAMPLE_TEST_BITS[13:], random.randint(0, 3))
+        choices.append(main.SampleTestsCreate(**{name: True for name in extras}))
+    return [random.choice(choices) for _ in range(n)]
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Boolean columns vs bit mask for sample tests")
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--profiles", type=int, default=4, help="distinct test selections in the batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tests = make_tests(args.samples, args.profiles)
+    rows = [dict(zip(main.SampleTestsCreate.__fields__, encode_columns(t))) for t in tests]
+    masks = [main.encode_test_mask(t) for t in tests]
+    assert [lab_csv_flags_columns(r) for r in rows] == [list(main.lab_csv_test_flags(m)) for m in masks]
+
+    timings = [
+        ("encode", best_of(args.repeat, lambda: [encode_columns(t) for t in tests]),
+                   best_of(args.repeat, lambda: [main.encode_test_mask(t) for t in tests])),
+        ("csv flags", best_of(args.repeat, lambda: [lab_csv_flags_columns(r) for r in rows]),
+                      best_of(args.repeat, lambda: [main.lab_csv_test_flags(m) for m in masks])),
+    ]
+
+    print(f"{args.samples} samples, {args.profiles} distinct selections")
+    print(f"{'step':>10} {'columns (s)':>12} {'mask (s)':>10} {'speedup':>8}")
+    for name, columns, mask in timings:
+        print(f"{name:>10} {columns:>12.4f} {mask:>10.4f} {columns / mask:>7.1f}x")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,203 @@
+# loadtest.py - Mixed read/write HTTP load against a running portal API
+#
+# Drives --concurrency clients for --duration seconds with a weighted mix of
+# list/detail/search reads and grower create/update/delete writes, then
+# reports requests/sec and p50/p95/p99 latency overall and per operation.
+# Growers it creates are named "Loadtest ..." and deleted again.
+#
+# To compare the threadpool (sync psycopg2) handlers with the async ones,
+# run the same load against a server started from each revision:
+#
+#   python benchmarks/loadtest.py --label sync  --out sync.json
+#   python benchmarks/loadtest.py --label async --out async.json
+#   python benchmarks/loadtest.py --compare sync.json async.json
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import httpx
+
+# (name, weight); weights are relative
+OPERATIONS = [
+    ("list_companies", 15),
+    ("list_growers", 15),
+    ("hierarchy", 10),
+    ("list_batches", 15),
+    ("search", 15),
+    ("stats", 10),
+    ("create_grower", 8),
+    ("update_grower", 6),
+    ("delete_grower", 6),
+]
+
+SEARCH_TERMS = ["a", "co", "far", "smith", "north", "field", "john", "acres"]
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+class LoadTest:
+    def __init__(self, client, company_ids):
+        self.client = client
+        self.company_ids = company_ids
+        self.created = []  # grower ids owned by this run, available for update/delete
+        self.latencies = {name: [] for name, _ in OPERATIONS}
+        self.errors = {name: 0 for name, _ in OPERATIONS}
+
+    async def request(self, name, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.latencies[name].append(time.perf_counter() - start)
+        if not ok:
+            self.errors[name] += 1
+        return response if ok else None
+
+    async def run_operation(self, name):
+        company_id = random.choice(self.company_ids)
+        if name == "list_companies":
+            await self.request(name, "GET", "/api/companies/")
+        elif name == "list_growers":
+            await self.request(name, "GET", f"/api/growers/company/{company_id}")
+        elif name == "hierarchy":
+            await self.request(name, "GET", "/api/hierarchy/", params={"company_id": company_id})
+        elif name == "list_batches":
+            await self.request(name, "GET", "/api/batches/", params={"limit": 50})
+        elif name == "search":
+            await self.request(name, "GET", "/api/search/", params={"q": random.choice(SEARCH_TERMS)})
+        elif name == "stats":
+            await self.request(name, "GET", "/api/stats")
+        elif name == "create_grower" or not self.created:
+            response = await self.request("create_grower", "POST", "/api/growers/", json={
+                "company_id": company_id,
+                "grower_name": f"Loadtest {uuid.uuid4().hex[:12]}",
+            })
+            if response is not None:
+                self.created.append((company_id, response.json()["id"]))
+        elif name == "update_grower":
+            # Taken out while in flight so a concurrent delete cannot pick it
+            grower = self.created.pop(random.randrange(len(self.created)))
+            await self.request(name, "PUT", f"/api/growers/{grower[1]}", json={
+                "company_id": grower[0],
+                "grower_name": f"Loadtest {uuid.uuid4().hex[:12]}",
+                "notes": "updated by loadtest",
+            })
+            self.created.append(grower)
+        elif name == "delete_grower":
+            _, grower_id = self.created.pop(random.randrange(len(self.created)))
+            await self.request(name, "DELETE", f"/api/growers/{grower_id}")
+
+    async def worker(self, deadline):
+        names = [name for name, _ in OPERATIONS]
+        weights = [weight for _, weight in OPERATIONS]
+        while time.perf_counter() < deadline:
+            await self.run_operation(random.choices(names, weights)[0])
+
+    async def cleanup(self):
+        for _, grower_id in self.created:
+            await self.client.delete(f"/api/growers/{grower_id}")
+        self.created.clear()
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        companies = (await client.get("/api/companies/")).json()
+        if not companies:
+            raise SystemExit("Need at least one company in the database to load test")
+        test = LoadTest(client, [c["id"] for c in companies])
+
+        if args.warmup:
+            await asyncio.gather(*(test.worker(time.perf_counter() + args.warmup)
+                                   for _ in range(args.concurrency)))
+            test.latencies = {name: [] for name, _ in OPERATIONS}
+            test.errors = {name: 0 for name, _ in OPERATIONS}
+
+        start = time.perf_counter()
+        await asyncio.gather(*(test.worker(start + args.duration) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        await test.cleanup()
+
+    all_latencies = [value for values in test.latencies.values() for value in values]
+    return {
+        "label": args.label,
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "duration_seconds": round(elapsed, 2),
+        "overall": summarize(all_latencies, sum(test.errors.values()), elapsed),
+        "operations": {
+            name: summarize(test.latencies[name], test.errors[name], elapsed)
+            for name, _ in OPERATIONS
+        },
+    }
+
+def print_result(result):
+    print(f"{result['label']}: {result['concurrency']} clients, {result['duration_seconds']}s")
+    print(f"{'operation':>15} {'requests':>9} {'errors':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(result["operations"].items()) + [("overall", result["overall"])]
+    for name, s in rows:
+        print(f"{name:>15} {s['requests']:>9} {s['errors']:>7} {s['rps']:>8} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{'operation':>15} {'rps ' + before['label']:>12} {'rps ' + after['label']:>12} "
+          f"{'p99 ' + before['label']:>12} {'p99 ' + after['label']:>12}")
+    names = list(before["operations"]) + ["overall"]
+    for name in names:
+        b = before["overall"] if name == "overall" else before["operations"].get(name)
+        a = after["overall"] if name == "overall" else after["operations"].get(name)
+        if not b or not a:
+            continue
+        print(f"{name:>15} {b['rps']:>12} {a['rps']:>12} {b['p99_ms']:>12} {a['p99_ms']:>12}")
+    if before["overall"]["rps"]:
+        print(f"throughput: {after['overall']['rps'] / before['overall']['rps']:.2f}x, "
+              f"p99: {before['overall']['p99_ms']} ms -> {after['overall']['p99_ms']} ms")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Mixed read/write load test for the portal API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of unmeasured load first")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out", help="write the result as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    result = asyncio.run(run(args))
+    print_result(result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    main_cli()
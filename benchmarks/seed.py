@@ -0,0 +1,294 @@
+# seed.py - Synthetic data for the benchmark suite
+#
+# Fills kas_portal with a realistic volume of bench data: companies ->
+# growers -> farms -> fields, batches of samples, and lab results for most
+# batches (lab_result_data cells). Samples and lab results are written
+# with the same helpers the API uses. Everything hangs off companies named
+# "Bench ...", which is how --cleanup finds it again.
+#
+# The desktop plot history source is seeded into a kas_desktop stand-in.
+# It is only created (and later dropped) when the database has no
+# kas_desktop schema of its own; a real one is never touched.
+#
+# Defaults give 2000 companies, 6000 growers, 100k samples and ~4M
+# lab_result_data cells. --growers sets the total grower count instead of
+# --growers-per-company (the search scenario targets 100k growers):
+#
+#   python benchmarks/seed.py
+#   python benchmarks/seed.py --companies 200 --batches 200 --samples-per-batch 50
+#   python benchmarks/seed.py --growers 100000
+#   python benchmarks/seed.py --cleanup
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+
+import main
+from bench_lab_import import make_lab_csv
+
+BENCH_PREFIX = "Bench "
+DESKTOP_STANDIN_COMMENT = "kas_portal benchmark stand-in"
+CROPS = ["CORN", "SOYBEANS", "WHEAT", "ALFALFA", "SORGHUM", "OATS"]
+STATES = ["IA", "NE", "IL", "MN", "KS", "SD", "MO", "WI"]
+
+DESKTOP_DDL = [
+    "CREATE SCHEMA kas_desktop",
+    f"COMMENT ON SCHEMA kas_desktop IS '{DESKTOP_STANDIN_COMMENT}'",
+    """
+    CREATE TABLE kas_desktop.batches (
+        batch_id INTEGER PRIMARY KEY,
+        import_date TIMESTAMP NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE kas_desktop.samples (
+        batch_id INTEGER NOT NULL,
+        sample_index INTEGER NOT NULL,
+        field_name TEXT NOT NULL,
+        value TEXT
+    )
+    """,
+    "CREATE INDEX ON kas_desktop.samples (batch_id, sample_index)",
+]
+
+def plot_ids(n):
+    return [f"P{i:06d}" for i in range(1, n + 1)]
+
+def log(message):
+    print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+def seed_hierarchy(cur, n_companies, growers_per, farms_per, fields_per, tag):
+    """Returns (company_id, grower_id, farm_id, field_id) for every seeded field."""
+    companies = execute_values(cur, """
+        INSERT INTO companies (company_name, contact_person, city, state, country)
+        VALUES %s RETURNING id
+    """, [(f"{BENCH_PREFIX}{tag} Co {i:05d}", f"Contact {i}", f"Town {i % 300}",
+           random.choice(STATES), "USA") for i in range(n_companies)],
+        page_size=1000, fetch=True)
+
+    growers = execute_values(cur, """
+        INSERT INTO growers (company_id, grower_name, city, state)
+        VALUES %s RETURNING id, company_id
+    """, [(c["id"], f"{BENCH_PREFIX}Grower {c['id']}-{g}", f"Town {g}", random.choice(STATES))
+          for c in companies for g in range(growers_per)],
+        page_size=1000, fetch=True)
+
+    farms = execute_values(cur, """
+        INSERT INTO farms (grower_id, farm_name, total_acres)
+        VALUES %s RETURNING id, grower_id
+    """, [(g["id"], f"{BENCH_PREFIX}Farm {g['id']}-{f}", random.randint(80, 2000))
+          for g in growers for f in range(farms_per)],
+        page_size=1000, fetch=True)
+
+    fields = execute_values(cur, """
+        INSERT INTO fields (farm_id, field_name, acres)
+        VALUES %s RETURNING id, farm_id
+    """, [(f["id"], f"{BENCH_PREFIX}Field {f['id']}-{d}", random.randint(10, 160))
+          for f in farms for d in range(fields_per)],
+        page_size=1000, fetch=True)
+
+    grower_company = {g["id"]: g["company_id"] for g in growers}
+    farm_grower = {f["id"]: f["grower_id"] for f in farms}
+    return [
+        (grower_company[farm_grower[f["farm_id"]]], farm_grower[f["farm_id"]], f["farm_id"], f["id"])
+        for f in fields
+    ]
+
+def make_batch_samples(n, company_fields, plots):
+    """n samples spread over one company's fields, tests drawn from a few profiles."""
+    profiles = [
+        main.SampleTestsCreate(),
+        main.SampleTestsCreate(test_cl=True, test_salts=True),
+        main.SampleTestsCreate(test_no3=True, test_nh3=True, test_olsen=True),
+    ]
+    samples = []
+    for i in range(n):
+        _, grower_id, farm_id, field_id = random.choice(company_fields)
+        samples.append(main.SampleCreate(
+            grower_id=grower_id, farm_id=farm_id, field_id=field_id,
+            sample_name=f"Zone {i % 12 + 1}", zone=str(i % 12 + 1), plot_id=random.choice(plots),
+            crop=random.choice(CROPS), yield_goal=random.choice([180, 200, 220, 60, 70]),
+            previous_crop=random.choice(CROPS), acres=round(random.uniform(1, 5), 1),
+            latitude=round(random.uniform(40, 45), 5), longitude=round(random.uniform(-97, -90), 5),
+            collect_datetime=datetime(2024, 1, 1) + timedelta(days=random.randint(0, 600)),
+            tests=random.choice(profiles),
+        ))
+    return samples
+
+def seed_batches(conn, cur, fields, n_batches, samples_per_batch, lab_fraction, analytes, plots):
+    by_company = {}
+    for row in fields:
+        by_company.setdefault(row[0], []).append(row)
+    companies = list(by_company)
+    cells = 0
+
+    for n in range(1, n_batches + 1):
+        company_id = random.choice(companies)
+        samples = make_batch_samples(samples_per_batch, by_company[company_id], plots)
+        cur.execute("SELECT generate_batch_id()")
+        batch_id = cur.fetchone()["generate_batch_id"]
+        batch_number = int(batch_id.split('-')[1])
+        cur.execute("""
+            INSERT INTO submission_batches
+            (batch_id, company_id, batch_number, sample_count, created_by, primary_grower_id)
+            VALUES (%s, %s, %s, %s, 'Benchmark', %s)
+        """, (batch_id, company_id, batch_number, len(samples), samples[0].grower_id))
+        main._insert_batch_samples(cur, batch_id, batch_number, company_id, samples, False)
+
+        if random.random() < lab_fraction:
+            cur.execute("""
+                INSERT INTO lab_results (batch_id, control_id, csv_filename, csv_path, sample_count, imported_by)
+                VALUES (%s, 'C1234', %s, %s, %s, 'Benchmark')
+                RETURNING id
+            """, (batch_id, f"{batch_id}.csv", os.path.join(main.CSV_UPLOAD_DIR, f"{batch_id}.csv"),
+                  len(samples)))
+            lab_result_id = cur.fetchone()["id"]
+            rows = csv.DictReader(StringIO(make_lab_csv(batch_id, batch_number, len(samples), analytes + 4)))
+            cells += main._store_lab_result_rows(cur, lab_result_id, batch_id, rows)[1]
+            cur.execute("""
+                UPDATE submission_batches
+                SET control_id = 'C1234', full_batch_id = %s, status = 'Lab Results Received'
+                WHERE batch_id = %s
+            """, (f"{batch_id}-C1234", batch_id))
+
+        if n % 50 == 0 or n == n_batches:
+            conn.commit()
+            log(f"batches {n}/{n_batches} ({n * samples_per_batch:,} samples, {cells:,} lab cells)")
+
+def desktop_schema_state(cur):
+    """'missing', 'standin' or 'real'."""
+    cur.execute("""
+        SELECT obj_description(oid, 'pg_namespace') AS comment
+        FROM pg_namespace WHERE nspname = 'kas_desktop'
+    """)
+    row = cur.fetchone()
+    if row is None:
+        return "missing"
+    return "standin" if row["comment"] == DESKTOP_STANDIN_COMMENT else "real"
+
+def seed_desktop(conn, cur, n_batches, samples_per_batch, plots):
+    state = desktop_schema_state(cur)
+    if state == "real":
+        log("kas_desktop exists and is not a benchmark stand-in; leaving it alone")
+        return
+    if state == "missing":
+        for statement in DESKTOP_DDL:
+            cur.execute(statement)
+    cur.execute("SELECT COALESCE(max(batch_id), 0) AS last FROM kas_desktop.batches")
+    first = cur.fetchone()["last"] + 1
+
+    start_date = datetime(2015, 1, 1)
+    batches = StringIO()
+    samples = StringIO()
+    for batch_id in range(first, first + n_batches):
+        import_date = start_date + timedelta(hours=batch_id * 7)
+        batches.write(f"{batch_id}\t{import_date.isoformat()}\n")
+        for index in range(samples_per_batch):
+            values = {
+                random.choice(main.PLOT_ID_FIELD_NAMES): random.choice(plots),
+                "Crop": random.choice(CROPS),
+                "Previous Crop": random.choice(CROPS),
+                "Expected_Yield": str(random.choice([180, 200, 220, 60])),
+                "Grower": f"Grower {batch_id % 500}",
+                "Farm": f"Farm {batch_id % 900}",
+                "Field": f"Field {index}",
+            }
+            for field_name, value in values.items():
+                samples.write(f"{batch_id}\t{index}\t{field_name}\t{value}\n")
+    batches.seek(0)
+    samples.seek(0)
+    cur.copy_expert("COPY kas_desktop.batches (batch_id, import_date) FROM STDIN", batches)
+    cur.copy_expert("COPY kas_desktop.samples (batch_id, sample_index, field_name, value) FROM STDIN", samples)
+    conn.commit()
+    log(f"kas_desktop stand-in: {n_batches:,} batches, {n_batches * samples_per_batch:,} samples")
+
+def cleanup(conn, cur):
+    cur.execute("""
+        SELECT sb.batch_id FROM submission_batches sb
+        JOIN companies c ON c.id = sb.company_id
+        WHERE c.company_name LIKE %s
+    """, (BENCH_PREFIX + "%",))
+    batch_ids = [row["batch_id"] for row in cur.fetchall()]
+    files = []
+    for n, batch_id in enumerate(batch_ids, start=1):
+        cur.execute(main.BATCH_DELETE, {"batch_id": batch_id})
+        deleted = cur.fetchone()
+        files.extend(deleted["upload_paths"])
+        if deleted["csv_path"]:
+            files.append(deleted["csv_path"])
+        if n % 200 == 0:
+            conn.commit()
+    conn.commit()
+    main._remove_files(files)
+    log(f"deleted {len(batch_ids):,} bench batches")
+
+    for statement in (
+        "DELETE FROM fields WHERE farm_id IN (SELECT f.id FROM farms f JOIN growers g ON f.grower_id = g.id "
+        "JOIN companies c ON g.company_id = c.id WHERE c.company_name LIKE %(prefix)s)",
+        "DELETE FROM farms WHERE grower_id IN (SELECT g.id FROM growers g "
+        "JOIN companies c ON g.company_id = c.id WHERE c.company_name LIKE %(prefix)s)",
+        "DELETE FROM growers WHERE company_id IN (SELECT id FROM companies WHERE company_name LIKE %(prefix)s)",
+        "DELETE FROM companies WHERE company_name LIKE %(prefix)s",
+    ):
+        cur.execute(statement, {"prefix": BENCH_PREFIX + "%"})
+    conn.commit()
+    log("deleted bench companies, growers, farms and fields")
+
+    if desktop_schema_state(cur) == "standin":
+        cur.execute("DELETE FROM plot_history WHERE batch_id IN (SELECT batch_id::text FROM kas_desktop.batches)")
+        cur.execute("DELETE FROM plot_history_batches WHERE batch_id IN (SELECT batch_id::text FROM kas_desktop.batches)")
+        cur.execute("DROP SCHEMA kas_desktop CASCADE")
+        conn.commit()
+        log("dropped kas_desktop stand-in")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Seed synthetic benchmark data")
+    parser.add_argument("--dsn", default=main.DATABASE_URL)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--growers-per-company", type=int, default=3)
+    parser.add_argument("--growers", type=int, help="total growers, spread evenly over the companies")
+    parser.add_argument("--farms-per-grower", type=int, default=2)
+    parser.add_argument("--fields-per-farm", type=int, default=2)
+    parser.add_argument("--batches", type=int, default=2000)
+    parser.add_argument("--samples-per-batch", type=int, default=50)
+    parser.add_argument("--lab-fraction", type=float, default=0.8, help="share of batches with lab results")
+    parser.add_argument("--analytes", type=int, default=50, help="lab result columns per sample")
+    parser.add_argument("--plots", type=int, default=20000, help="distinct plot IDs")
+    parser.add_argument("--desktop-batches", type=int, default=5000)
+    parser.add_argument("--desktop-samples-per-batch", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cleanup", action="store_true", help="remove previously seeded data and exit")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    conn = psycopg2.connect(args.dsn)
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        if args.cleanup:
+            cleanup(conn, cur)
+        else:
+            plots = plot_ids(args.plots)
+            tag = f"{int(time.time()):x}"
+            growers_per = -(-args.growers // args.companies) if args.growers else args.growers_per_company
+            fields = seed_hierarchy(cur, args.companies, growers_per,
+                                    args.farms_per_grower, args.fields_per_farm, tag)
+            conn.commit()
+            log(f"{args.companies:,} companies, {args.companies * growers_per:,} growers, {len(fields):,} fields")
+            seed_batches(conn, cur, fields, args.batches, args.samples_per_batch,
+                         args.lab_fraction, args.analytes, plots)
+            seed_desktop(conn, cur, args.desktop_batches, args.desktop_samples_per_batch, plots)
+            cur.execute("ANALYZE")
+            conn.commit()
+    conn.close()
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,339 @@
+# suite.py - End-to-end benchmark of the portal API against seeded data
+#
+# Starts the API (uvicorn main:app) unless --url points at one already
+# running, then drives each scenario on its own with --concurrency clients
+# for --duration seconds and records throughput, p50/p95/p99 latency,
+# errors and the server's peak RSS. Fixtures (fields, batches, plot IDs,
+# names to search for) come from data written by seed.py.
+#
+# The search scenario's target is p95 under 20 ms with 100k growers
+# (seed.py --growers 100000).
+#
+# Results are JSON, tagged with the git commit, so runs can be compared:
+#
+#   python benchmarks/seed.py
+#   python benchmarks/suite.py --out bench-$(git rev-parse --short HEAD).json
+#   python benchmarks/suite.py --compare bench-old.json bench-new.json
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+import main
+from bench_lab_import import make_lab_csv
+from loadtest import summarize
+from seed import BENCH_PREFIX, CROPS
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    "create_batch",
+    "import_lab_results",
+    "generate_lab_csv",
+    "export_for_rec_system",
+    "list_batches",
+    "get_plot_history",
+    "search",
+]
+
+def load_fixtures(dsn):
+    conn = psycopg2.connect(dsn)
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SET search_path TO {main.SCHEMA_NAME}")
+        cur.execute("""
+            SELECT g.company_id, g.id AS grower_id, f.id AS farm_id, fd.id AS field_id
+            FROM fields fd
+            JOIN farms f ON fd.farm_id = f.id
+            JOIN growers g ON f.grower_id = g.id
+            JOIN companies c ON g.company_id = c.id
+            WHERE c.company_name LIKE %s
+            ORDER BY random() LIMIT 5000
+        """, (BENCH_PREFIX + "%",))
+        fields = cur.fetchall()
+        cur.execute("""
+            SELECT sb.batch_id, sb.control_id IS NOT NULL AS has_results
+            FROM submission_batches sb
+            JOIN companies c ON sb.company_id = c.id
+            WHERE c.company_name LIKE %s
+            ORDER BY random() LIMIT 5000
+        """, (BENCH_PREFIX + "%",))
+        batches = cur.fetchall()
+        cur.execute("SELECT DISTINCT plot_id FROM plot_history ORDER BY 1 LIMIT 20000")
+        plots = [row["plot_id"] for row in cur.fetchall()]
+        cur.execute("""
+            SELECT g.grower_name AS name FROM growers g
+            JOIN companies c ON g.company_id = c.id
+            WHERE c.company_name LIKE %s
+            ORDER BY random() LIMIT 2000
+        """, (BENCH_PREFIX + "%",))
+        names = [row["name"] for row in cur.fetchall()]
+    conn.close()
+    if not fields or not batches:
+        raise SystemExit("No seeded data found; run benchmarks/seed.py first")
+    return {
+        "fields": fields,
+        "batches": [b["batch_id"] for b in batches],
+        "batches_with_results": [b["batch_id"] for b in batches if b["has_results"]],
+        "plots": plots or ["P000001"],
+        "names": names,
+    }
+
+def search_term(names):
+    """A typeahead-like term: a name prefix, a fragment from its middle, or a two-character prefix."""
+    name = random.choice(names)[len(BENCH_PREFIX):]
+    kind = random.random()
+    if kind < 0.5:
+        return name[:random.randint(3, len(name))]
+    if kind < 0.9:
+        start = random.randint(1, len(name) - 3)
+        return name[start:start + random.randint(3, 6)]
+    return name[:2]
+
+def batch_payload(fields, n_samples):
+    company_id = random.choice(fields)["company_id"]
+    company_fields = [f for f in fields if f["company_id"] == company_id]
+    return {
+        "company_id": company_id,
+        "created_by": "Benchmark",
+        "samples": [
+            {
+                "grower_id": f["grower_id"], "farm_id": f["farm_id"], "field_id": f["field_id"],
+                "sample_name": f"Zone {i % 12 + 1}", "plot_id": f"P{random.randint(1, 20000):06d}",
+                "crop": random.choice(CROPS), "yield_goal": 200, "acres": 2.5,
+                "tests": {"test_cl": i % 3 == 0},
+            }
+            for i, f in enumerate(random.choice(company_fields) for _ in range(n_samples))
+        ],
+    }
+
+class Scenarios:
+    """One method per scenario; each makes a single measured request and returns (ok, seconds)."""
+
+    def __init__(self, client, fixtures, args):
+        self.client = client
+        self.fixtures = fixtures
+        self.args = args
+        self.list_cursor = None
+
+    async def timed(self, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        return ok, time.perf_counter() - start, response
+
+    async def create_batch(self):
+        payload = batch_payload(self.fixtures["fields"], self.args.batch_samples)
+        ok, elapsed, _ = await self.timed("POST", "/api/batches/", json=payload)
+        return ok, elapsed
+
+    async def import_lab_results(self):
+        # Setup (a fresh batch to import into) is not part of the measurement
+        response = await self.client.post(
+            "/api/batches/", json=batch_payload(self.fixtures["fields"], self.args.batch_samples)
+        )
+        if response.status_code >= 400:
+            return False, 0.0
+        batch = response.json()
+        content = make_lab_csv(batch["batch_id"], batch["batch_number"],
+                               batch["sample_count"], self.args.analytes + 4)
+        files = {"files": (f"{batch['batch_id']}_bench.csv", content.encode(), "text/csv")}
+        ok, elapsed, response = await self.timed("POST", "/api/lab-results/import", files=files)
+        if ok:
+            self.fixtures["batches_with_results"].append(batch["batch_id"])
+        return ok and response.json()["results"][0]["status"] == "success", elapsed
+
+    async def generate_lab_csv(self):
+        batch_id = random.choice(self.fixtures["batches"])
+        ok, elapsed, _ = await self.timed("POST", f"/api/batches/{batch_id}/generate-csv")
+        return ok, elapsed
+
+    async def export_for_rec_system(self):
+        batch_id = random.choice(self.fixtures["batches_with_results"])
+        ok, elapsed, _ = await self.timed("POST", f"/api/batches/{batch_id}/export-for-rec-system")
+        return ok, elapsed
+
+    async def list_batches(self):
+        # Walks pages with the keyset cursor, restarting at the end
+        params = {"limit": 100}
+        if self.list_cursor:
+            params["cursor"] = self.list_cursor
+        ok, elapsed, response = await self.timed("GET", "/api/batches/", params=params)
+        self.list_cursor = response.headers.get("X-Next-Cursor") if ok else None
+        return ok, elapsed
+
+    async def get_plot_history(self):
+        plot_id = random.choice(self.fixtures["plots"])
+        ok, elapsed, _ = await self.timed("GET", f"/api/plot-history/{plot_id}")
+        return ok, elapsed
+
+    async def search(self):
+        term = search_term(self.fixtures["names"])
+        ok, elapsed, _ = await self.timed("GET", "/api/search/", params={"q": term})
+        return ok, elapsed
+
+async def run_scenario(client, fixtures, args, name):
+    latencies = []
+    errors = 0
+
+    async def worker(deadline):
+        nonlocal errors
+        scenarios = Scenarios(client, fixtures, args)
+        op = getattr(scenarios, name)
+        while time.perf_counter() < deadline:
+            ok, elapsed = await op()
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(start + args.duration) for _ in range(args.concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+def peak_rss_kb(pid):
+    """Peak resident set size of a process (Linux /proc), or None."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+def start_server(port):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=REPO_DIR,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url + "/", timeout=1).status_code == 200:
+                return server, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("API server did not start")
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args, url, server_pid):
+    fixtures = load_fixtures(args.dsn)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        await client.post("/api/plot-history/refresh")
+        for name in args.scenarios:
+            if name == "export_for_rec_system" and not fixtures["batches_with_results"]:
+                print(f"{name}: skipped, no batches with lab results")
+                continue
+            if name == "search" and not fixtures["names"]:
+                print(f"{name}: skipped, no seeded growers")
+                continue
+            results[name] = await run_scenario(client, fixtures, args, name)
+            if server_pid:
+                results[name]["server_peak_rss_kb"] = peak_rss_kb(server_pid)
+            r = results[name]
+            print(f"{name:>22} {r['requests']:>7} req {r['errors']:>5} err {r['rps']:>8} rps "
+                  f"p50 {r['p50_ms']:>8} p95 {r['p95_ms']:>8} p99 {r['p99_ms']:>8} ms", flush=True)
+    return results
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"before {before['commit']}  after {after['commit']}")
+    print(f"{'scenario':>22} {'rps':>17} {'p99 ms':>21} {'peak RSS MB':>19}")
+    for name in SCENARIOS:
+        b = before["scenarios"].get(name)
+        a = after["scenarios"].get(name)
+        if not b or not a:
+            continue
+        rss = "-"
+        if b.get("server_peak_rss_kb") and a.get("server_peak_rss_kb"):
+            rss = f"{b['server_peak_rss_kb'] / 1024:.0f} -> {a['server_peak_rss_kb'] / 1024:.0f}"
+        print(f"{name:>22} {b['rps']:>7} -> {a['rps']:<7} {b['p99_ms']:>9} -> {a['p99_ms']:<9} {rss:>19}")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="End-to-end portal benchmark suite")
+    parser.add_argument("--dsn", default=main.DATABASE_URL)
+    parser.add_argument("--url", help="benchmark an already running API instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="pid of the --url server, for peak RSS")
+    parser.add_argument("--port", type=int, default=8765, help="port for the API started by the suite")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20, help="seconds per scenario")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds")
+    parser.add_argument("--batch-samples", type=int, default=50, help="samples per created batch")
+    parser.add_argument("--analytes", type=int, default=50, help="lab result columns per imported sample")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    random.seed(args.seed)
+    server = None
+    url, server_pid = args.url, args.server_pid
+    if not url:
+        server, url = start_server(args.port)
+        server_pid = server.pid
+    try:
+        scenarios = asyncio.run(run(args, url, server_pid))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(30)
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "batch_samples": args.batch_samples,
+            "analytes": args.analytes,
+        },
+        "scenarios": scenarios,
+        "server_peak_rss_kb": peak_rss_kb(server_pid) if server_pid and not server else None,
+        "client_peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    if server:
+        # The server has exited by now; its peak is the max over scenarios
+        result["server_peak_rss_kb"] = max(
+            (s.get("server_peak_rss_kb") or 0 for s in scenarios.values()), default=None
+        )
+    print(json.dumps({k: result[k] for k in ("commit", "server_peak_rss_kb", "client_peak_rss_kb")}))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    main_cli()